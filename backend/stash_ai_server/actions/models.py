@@ -21,6 +21,21 @@ class ContextInput(BaseModel):
         'extra': 'ignore'
     }
 
+    @property
+    def target_ids(self) -> tuple[str, ...]:
+        """Ids an action should operate on.
+
+        Detail view: the entity. Library view: the explicit selection, else the
+        entity (single-item chunks built by tasks.helpers), else the visible page.
+        """
+        if self.is_detail_view:
+            return (self.entity_id,) if self.entity_id else ()
+        if self.selected_ids:
+            return tuple(self.selected_ids)
+        if self.entity_id:
+            return (self.entity_id,)
+        return tuple(self.visible_ids or ())
+
 class ContextRule(BaseModel):
     pages: List[str] = Field(default_factory=list, description="Allowed page keys (empty = any)")
     selection: SelectionMode = 'both'
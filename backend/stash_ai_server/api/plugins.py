@@ -10,6 +10,7 @@ from stash_ai_server.utils.string_utils import normalize_null_strings
 from stash_ai_server.db.session import SessionLocal
 from stash_ai_server.models.plugin import PluginMeta, PluginSource, PluginCatalog, PluginSetting
 from stash_ai_server.plugin_runtime import loader as plugin_loader
+from stash_ai_server.plugin_runtime.settings_registry import notify_setting_changed
 from stash_ai_server.core.system_settings import SYSTEM_PLUGIN_NAME, get_value as sys_get_value, invalidate_cache as sys_invalidate_cache
 from stash_ai_server.core.runtime import schedule_backend_restart
 from stash_ai_server.utils.path_mutation import invalidate_path_mapping_cache
@@ -188,6 +189,7 @@ async def upsert_setting(plugin_name: str, key: str, payload: SettingUpsert, db:
     db.commit()
     if key == 'path_mappings':
         invalidate_path_mapping_cache(plugin_name)
+    notify_setting_changed(plugin_name, key, row.value if row.value is not None else row.default_value)
     return {'status': 'ok'}
 
 # ---------------- System (global) settings endpoints -----------------
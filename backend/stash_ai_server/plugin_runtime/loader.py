@@ -18,7 +18,7 @@ from stash_ai_server.db.session import SessionLocal, engine
 from stash_ai_server.core.config import settings
 from stash_ai_server.models.plugin import PluginMeta, PluginSetting, PluginSource, PluginCatalog
 from stash_ai_server.utils.string_utils import normalize_null_strings
-from stash_ai_server.plugin_runtime.settings_registry import register_settings
+from stash_ai_server.plugin_runtime.settings_registry import register_settings, unregister_setting_change_listeners_by_plugin
 from stash_ai_server.services.registry import services
 from stash_ai_server.recommendations.registry import recommender_registry
 from stash_ai_server.core.runtime import register_backend_refresh_handler
@@ -730,6 +730,10 @@ def _unload_plugin(plugin_name: str):
         recommender_registry.unregister_by_module_prefix(prefix)
     except Exception:
         pass
+    try:
+        unregister_setting_change_listeners_by_plugin(plugin_name)
+    except Exception:
+        pass
     # Collect keys first to avoid mutating while iterating
     keys = [k for k in list(sys.modules.keys()) if k == prefix or k.startswith(prefix + '.')]
     for k in keys:
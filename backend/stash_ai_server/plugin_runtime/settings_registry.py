@@ -5,13 +5,27 @@ Future: We may generalize this to handle both plugin-scoped and global
 settings rows via a unified table. For now we keep the existing plugin
 settings model and reuse the logic.
 """
-from typing import Iterable, Mapping, Any, Dict
+import logging
+from typing import Callable, Iterable, Mapping, Any, Dict
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from stash_ai_server.models.plugin import PluginSetting
 from stash_ai_server.utils.string_utils import normalize_null_strings
 
+_log = logging.getLogger(__name__)
+
+SettingChangeListener = Callable[[str, Any], None]
+
+# plugin_name -> listener name -> callback(key, effective_value)
+_CHANGE_LISTENERS: Dict[str, Dict[str, SettingChangeListener]] = {}
+
 def register_settings(db: Session, plugin_name: str, definitions: Iterable[Mapping[str, Any]]):
+    """Create or refresh a plugin's setting rows from its manifest definitions.
+
+    Values backfilled from defaults here are not pushed to setting change
+    listeners: the loader calls this before importing the plugin's modules,
+    so they read the stored values directly when they register.
+    """
     existing_rows = db.execute(select(PluginSetting).where(PluginSetting.plugin_name == plugin_name)).scalars().all()
     by_key: Dict[str, PluginSetting] = {r.key: r for r in existing_rows}
     changed = False
@@ -91,3 +105,39 @@ def load_plugin_settings(plugin_name: str) -> dict[str, Any]:
                 session.close()
         except Exception:
             pass
+
+
+def register_setting_change_listener(plugin_name: str, name: str, callback: SettingChangeListener) -> None:
+    """Register a named callback invoked in-process when a plugin setting is written.
+
+    Plugins use this to refresh module-level caches of their settings without
+    re-querying the database. Re-registering the same name replaces the
+    previous callback. Updates are pushed by the settings PUT endpoint only;
+    register_settings does not notify. Listeners are dropped when the plugin
+    is unloaded.
+    """
+    if not callable(callback):
+        raise TypeError("setting change listener must be callable")
+    _CHANGE_LISTENERS.setdefault(plugin_name, {})[name] = callback
+
+
+def unregister_setting_change_listener(plugin_name: str, name: str) -> None:
+    listeners = _CHANGE_LISTENERS.get(plugin_name)
+    if listeners is None:
+        return
+    listeners.pop(name, None)
+    if not listeners:
+        _CHANGE_LISTENERS.pop(plugin_name, None)
+
+
+def unregister_setting_change_listeners_by_plugin(plugin_name: str) -> None:
+    _CHANGE_LISTENERS.pop(plugin_name, None)
+
+
+def notify_setting_changed(plugin_name: str, key: str, value: Any) -> None:
+    """Push an updated (effective) setting value to the plugin's listeners."""
+    for name, callback in list(_CHANGE_LISTENERS.get(plugin_name, {}).items()):
+        try:
+            callback(key, value)
+        except Exception:
+            _log.exception("setting change listener %s for plugin %s failed", name, plugin_name)
@@ -1,6 +1,11 @@
 import asyncio
 import logging
-from typing import Any, Dict, List
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping
 from urllib.parse import urlparse
 
 from stash_ai_server.core.config import settings
@@ -11,17 +16,109 @@ from stashapi.stashapp import StashInterface
 
 _log = logging.getLogger(__name__)
 
+_STASH_REQUEST_WORKERS = 8
+_TAG_CACHE_MAXSIZE = 8192
+_IMAGE_PATH_CHUNK_SIZE = 500
+_TAG_ID_CHUNK_SIZE = 500
+
+
+class _TagBiCache:
+    """Bounded tag cache: many names (case variants, aliases) -> id, and id -> canonical name.
+
+    Ids are stored as ints. Entries are evicted per id, least recently used
+    first, taking every name that points at the id with them.
+    """
+
+    def __init__(self, maxsize: int = _TAG_CACHE_MAXSIZE) -> None:
+        self.maxsize = max(1, maxsize)
+        self._by_name: Dict[str, int] = {}
+        self._by_id: OrderedDict[int, str] = OrderedDict()
+        self._names: Dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get_id(self, name: str) -> int | None:
+        with self._lock:
+            tag_id = self._by_name.get(name)
+            if tag_id is not None:
+                self._by_id.move_to_end(tag_id)
+            return tag_id
+
+    def get_name(self, tag_id: int | str) -> str | None:
+        try:
+            tag_id = int(tag_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            name = self._by_id.get(tag_id)
+            if name is not None:
+                self._by_id.move_to_end(tag_id)
+            return name
+
+    def put(self, tag_id: int | str, name: str, canonical: str | None = None) -> None:
+        """Map ``name`` to ``tag_id``; ``canonical`` (default: first name seen) becomes the id's name."""
+        tag_id = int(tag_id)
+        with self._lock:
+            previous = self._by_id.get(tag_id)
+            if canonical is not None and previous is not None and previous not in (canonical, name):
+                # The tag was renamed in Stash; its old name no longer resolves here.
+                if self._by_name.get(previous) == tag_id:
+                    del self._by_name[previous]
+                self._names.get(tag_id, set()).discard(previous)
+            names = self._names.setdefault(tag_id, set())
+            for alias in (name, canonical):
+                if alias is None:
+                    continue
+                if self._by_name.get(alias, tag_id) != tag_id:
+                    self._unlink(alias)
+                self._by_name[alias] = tag_id
+                names.add(alias)
+            if canonical is not None or tag_id not in self._by_id:
+                self._by_id[tag_id] = canonical if canonical is not None else name
+            self._by_id.move_to_end(tag_id)
+            while len(self._by_id) > self.maxsize:
+                evicted_id = next(iter(self._by_id))
+                self._drop_id(evicted_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_name.clear()
+            self._by_id.clear()
+            self._names.clear()
+
+    def ids_by_name(self) -> Mapping[str, int]:
+        return MappingProxyType(self._by_name)
+
+    def names_by_id(self) -> Mapping[int, str]:
+        return MappingProxyType(self._by_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _unlink(self, alias: str) -> None:
+        old_id = self._by_name.pop(alias, None)
+        if old_id is None:
+            return
+        if self._by_id.get(old_id) == alias:
+            # Losing an id's own name leaves the whole entry stale.
+            self._drop_id(old_id)
+        else:
+            self._names.get(old_id, set()).discard(alias)
+
+    def _drop_id(self, tag_id: int) -> None:
+        self._by_id.pop(tag_id, None)
+        for alias in self._names.pop(tag_id, ()):
+            if self._by_name.get(alias) == tag_id:
+                del self._by_name[alias]
+
+
 class StashAPI:
     stash_url: str
     api_key: str | None
     stash_interface: StashInterface | None = None
-    tag_id_cache: Dict[str, int] = {}
-    tag_name_cache: Dict[int, str] = {}
     _effective_url: str | None = None
 
     def __init__(self) -> None:
-        self.tag_id_cache = {}
-        self.tag_name_cache = {}
+        self._tags = _TagBiCache()
         self.stash_interface = None
         self.stash_url = ''
         self.api_key = None
@@ -37,8 +134,7 @@ class StashAPI:
             self.stash_url = ""
             self.api_key = new_key
             self.stash_interface = None
-            self.tag_id_cache.clear()
-            self.tag_name_cache.clear()
+            self._tags.clear()
             _log.warning("STASH_URL not configured; Stash interface unavailable")
             return
 
@@ -58,8 +154,7 @@ class StashAPI:
         self._effective_url = effective_url
         self.api_key = new_key
         self.stash_interface = new_interface
-        self.tag_id_cache.clear()
-        self.tag_name_cache.clear()
+        self._tags.clear()
         if effective_url != new_url:
             _log.info(
                 "Stash API client configured host=%s (effective=%s)",
@@ -69,49 +164,151 @@ class StashAPI:
         else:
             _log.info("Stash API client configured host=%s", self.stash_url)
 
+    def get_cached_tag_id(self, tag_name: str) -> int | None:
+        """Return the cached id for a tag name (or alias) without querying Stash."""
+        return self._tags.get_id(tag_name)
+
+    def get_cached_tag_name(self, tag_id: int | str) -> str | None:
+        """Return the cached name for a tag id without querying Stash."""
+        return self._tags.get_name(tag_id)
+
+    @property
+    def tag_id_cache(self) -> Mapping[str, int]:
+        """Deprecated read-only view of name -> id entries; use get_cached_tag_id.
+
+        The cache is no longer writable from outside; entries are added by the
+        lookup methods. The view is live and unlocked, so do not iterate it while
+        other threads use the API.
+        """
+        warnings.warn("StashAPI.tag_id_cache is deprecated; use get_cached_tag_id", DeprecationWarning, stacklevel=2)
+        return self._tags.ids_by_name()
+
+    @property
+    def tag_name_cache(self) -> Mapping[int, str]:
+        """Deprecated read-only view of id -> name entries; use get_cached_tag_name.
+
+        Same caveats as tag_id_cache.
+        """
+        warnings.warn("StashAPI.tag_name_cache is deprecated; use get_cached_tag_name", DeprecationWarning, stacklevel=2)
+        return self._tags.names_by_id()
+
     # Tags
     
     def fetch_tag_id(self, tag_name: str, parent_id: int | None = None, create_if_missing: bool = False, use_cache: bool = True, add_to_cache: Dict[str, int] = None) -> int | None:
-        if use_cache and tag_name in self.tag_id_cache:
-            return self.tag_id_cache[tag_name]
+        if use_cache:
+            cached = self._tags.get_id(tag_name)
+            if cached is not None:
+                return cached
         
         if create_if_missing:
             if parent_id is None:
-                tag = self.stash_interface.find_tag(tag_name, create=True)["id"]
+                tag = self.stash_interface.find_tag(tag_name, create=True)
             else:
                 tag = self.stash_interface.find_tag(tag_name)
                 if tag is None:
                     tag = self.stash_interface.create_tag({"name":tag_name, "ignore_auto_tag": True, "parent_ids":[parent_id]})
-                tag = tag["id"] if tag else None
         else:
             tag = self.stash_interface.find_tag(tag_name)
-            tag = tag["id"]  if tag else None
-        if tag:
-            self.tag_id_cache[tag_name] = tag
-            self.tag_name_cache[tag] = tag_name 
+        if tag and tag.get("id"):
+            # Stash matches names case-insensitively and by alias; remember the
+            # requested spelling and the tag's own name.
+            tag_id = int(tag["id"])
+            self._tags.put(tag_id, tag_name, canonical=tag.get("name"))
             if add_to_cache is not None and tag_name not in add_to_cache:
-                add_to_cache[tag_name] = tag
-            return tag
+                add_to_cache[tag_name] = tag_id
+            return tag_id
         return None
 
+    async def fetch_tag_ids_bulk_async(self, tag_names: list[str], parent_id: int | None = None, create_if_missing: bool = False, use_cache: bool = True) -> Dict[str, int]:
+        return await asyncio.to_thread(self.fetch_tag_ids_bulk, tag_names, parent_id, create_if_missing, use_cache)
+
+    def fetch_tag_ids_bulk(self, tag_names: list[str], parent_id: int | None = None, create_if_missing: bool = False, use_cache: bool = True) -> Dict[str, int]:
+        """Resolve (and optionally create) many tags, overlapping the lookups for cache misses.
+
+        Returns a name -> id map; names that could not be resolved (or whose
+        lookup failed) are omitted. Stash tag names are unique regardless of
+        case, so names differing only in case are looked up once and share an id.
+        """
+        out: Dict[str, int] = {}
+        # casefolded name -> spelling sent to Stash
+        missing: Dict[str, str] = {}
+        for tag_name in tag_names:
+            if tag_name in out:
+                continue
+            cached = self._tags.get_id(tag_name) if use_cache else None
+            if cached is not None:
+                out[tag_name] = cached
+            else:
+                missing.setdefault(tag_name.casefold(), tag_name)
+        if not missing:
+            return out
+
+        def _fetch(tag_name: str) -> int | None:
+            try:
+                return self.fetch_tag_id(tag_name, parent_id=parent_id, create_if_missing=create_if_missing, use_cache=False)
+            except Exception:
+                _log.exception("Failed to fetch tag id for tag_name=%s", tag_name)
+                return None
+
+        lookups = list(missing.values())
+        with ThreadPoolExecutor(max_workers=min(_STASH_REQUEST_WORKERS, len(lookups))) as pool:
+            resolved = dict(zip(lookups, pool.map(_fetch, lookups)))
+        for tag_name in tag_names:
+            if tag_name in out:
+                continue
+            tag_id = resolved.get(missing.get(tag_name.casefold()))
+            if tag_id is not None:
+                out[tag_name] = tag_id
+        return out
+
     def get_tags_with_parent(self, parent_tag_id: int) -> Dict[str, int]:
         return {item['name']: item['id'] for item in self.stash_interface.find_tags(f={"parents": {"value":parent_tag_id, "modifier":"INCLUDES"}}, fragment="id name")}
 
     def get_stash_tag_name(self, tag_id: int) -> str | None:
         """Get the tag name for a given tag ID from Stash."""
-        if tag_id in self.tag_name_cache:
-            return self.tag_name_cache[tag_id]
+        cached = self._tags.get_name(tag_id)
+        if cached is not None:
+            return cached
         try:
             tag_data = self.stash_interface.find_tag(tag_id)
             if tag_data and "name" in tag_data:
-                self.tag_name_cache[tag_id] = tag_data["name"]
-                self.tag_id_cache[tag_data["name"]] = tag_id
+                self._tags.put(tag_id, tag_data["name"], canonical=tag_data["name"])
                 return tag_data["name"]
             return None
         except Exception:
             _log.exception("Failed to get tag name for tag_id=%s", tag_id)
             return None
 
+    def get_stash_tag_names(self, tag_ids: list[int]) -> Dict[int, str]:
+        """Get tag names for many tag IDs, querying Stash in chunks for cache misses only."""
+        out: Dict[int, str] = {}
+        missing: list[int] = []
+        for tag_id in dict.fromkeys(tag_ids):
+            cached = self._tags.get_name(tag_id)
+            if cached is not None:
+                out[tag_id] = cached
+            else:
+                missing.append(tag_id)
+        for idx in range(0, len(missing), _TAG_ID_CHUNK_SIZE):
+            chunk = missing[idx : idx + _TAG_ID_CHUNK_SIZE]
+            try:
+                tags = self.stash_interface.find_tags(
+                    f={"id": {"value": chunk, "modifier": "INCLUDES"}},
+                    fragment="id name",
+                )
+            except Exception:
+                _log.exception("Failed to get tag names for tag_ids=%s", chunk)
+                continue
+            for tag in tags or []:
+                try:
+                    tag_id = int(tag["id"])
+                    name = tag["name"]
+                except Exception:
+                    continue
+                self._tags.put(tag_id, name, canonical=name)
+                out[tag_id] = name
+        return out
+
     # Images    
     async def remove_tags_from_images_async(self, image_ids: list[int], tag_ids: list[int]) -> bool:
         await asyncio.to_thread(self.stash_interface.update_images, {"ids": image_ids, "tag_ids": {"ids": tag_ids, "mode": "REMOVE"}})
@@ -134,19 +331,21 @@ class StashAPI:
         if not self.stash_interface:
             _log.warning("Stash interface not configured; returning empty image path map")
             return out
-        try:
-            images = self.stash_interface.find_images(image_ids=images_ids, fragment="id files {path}")
-            _log.warning(f"Images: {images}")
-        except Exception as exc:  # pragma: no cover - defensive
-            _log.warning("Failed to fetch images for ids=%s: %s", images_ids, exc)
-            return out
-        for img in images or []:
+        for idx in range(0, len(images_ids), _IMAGE_PATH_CHUNK_SIZE):
+            chunk = images_ids[idx : idx + _IMAGE_PATH_CHUNK_SIZE]
             try:
-                out[int(img["id"])] = img["files"][0]["path"]
-            except Exception:
-                # defensive: skip malformed entries
+                images = self.stash_interface.find_images(image_ids=chunk, fragment="id files {path}")
+                _log.debug("Images: %r", images)
+            except Exception as exc:  # pragma: no cover - defensive
+                _log.warning("Failed to fetch images for ids=%s: %s", chunk, exc)
                 continue
-        _log.warning("Fetched image paths for ids=%s -> %s", images_ids, out)
+            for img in images or []:
+                try:
+                    out[int(img["id"])] = img["files"][0]["path"]
+                except Exception:
+                    # defensive: skip malformed entries
+                    continue
+        _log.debug("Fetched image paths for ids=%s -> %s", images_ids, out)
         return out
     
     async def get_all_images_async(self) -> List[str]:
@@ -322,17 +521,50 @@ class StashAPI:
         await asyncio.to_thread(self.create_scene_markers, scene_id, timespans)
 
     def create_scene_markers(self, scene_id: int,timespans: Dict[tuple[int, str], list[tuple[float, float]]]):
-        for (tag_id, tag_name), spans in timespans.items():
-            for start, end in spans:
-                marker_data = {
-                    "scene_id": scene_id,
-                    "seconds": start,
-                    "end_seconds": end,
-                    "primary_tag_id": tag_id,
-                    "tag_ids": [tag_id],
-                    "title": tag_name,
-                }
-                self.stash_interface.create_scene_marker(marker_data)
+        """Create one marker per (tag, span), sending the requests concurrently.
+
+        Every marker is attempted even if another one fails, so a failure is a
+        partial write: the remaining markers already exist when the first error
+        is re-raised. Failed markers are logged; callers retrying should clear
+        the affected tags first (see destroy_markers_with_tags) to avoid duplicates.
+        """
+        markers = [
+            {
+                "scene_id": scene_id,
+                "seconds": start,
+                "end_seconds": end,
+                "primary_tag_id": tag_id,
+                "tag_ids": [tag_id],
+                "title": tag_name,
+            }
+            for (tag_id, tag_name), spans in timespans.items()
+            for start, end in spans
+        ]
+        if not markers:
+            return
+        if len(markers) == 1:
+            self.stash_interface.create_scene_marker(markers[0])
+            return
+        with ThreadPoolExecutor(max_workers=min(_STASH_REQUEST_WORKERS, len(markers))) as pool:
+            futures = [pool.submit(self.stash_interface.create_scene_marker, marker) for marker in markers]
+        failures = [(marker, future.exception()) for marker, future in zip(markers, futures) if future.exception() is not None]
+        if failures:
+            for marker, exc in failures:
+                _log.warning(
+                    "Failed to create scene marker scene_id=%s tag_id=%s span=%s-%s: %s",
+                    scene_id,
+                    marker["primary_tag_id"],
+                    marker["seconds"],
+                    marker["end_seconds"],
+                    exc,
+                )
+            _log.warning(
+                "Created %d of %d scene markers for scene_id=%s",
+                len(markers) - len(failures),
+                len(markers),
+                scene_id,
+            )
+            raise failures[0][1]
         
 
 def _have_valid_api_key(api_key) -> bool:
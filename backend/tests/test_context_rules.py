@@ -55,3 +55,31 @@ def test_both_allows_any_library_state():
     assert rule.matches(make_ctx(selected=['1']))
     assert rule.matches(make_ctx(selected=[]))
     assert not rule.matches(make_ctx(detail=True, selected=[]))
+
+
+def test_target_ids_prefers_detail_then_selected_then_entity_then_visible():
+    detail = ContextInput(page='scenes', entityId='7', isDetailView=True, selectedIds=['1'])
+    assert detail.target_ids == ('7',)
+    assert make_ctx(selected=['1', '2'], visible=['3']).target_ids == ('1', '2')
+    library_entity = ContextInput(page='scenes', entityId='8', isDetailView=False, selectedIds=[], visibleIds=['3'])
+    assert library_entity.target_ids == ('8',)
+    assert make_ctx(selected=[], visible=['3', '4']).target_ids == ('3', '4')
+    assert make_ctx().target_ids == ()
+
+
+def test_target_ids_tracks_mutation_and_copies():
+    ctx = make_ctx(selected=['1'])
+    ctx.selected_ids = ['9']
+    assert ctx.target_ids == ('9',)
+
+    copied = ctx.model_copy(update={'selected_ids': ['5', '6']})
+    assert copied.target_ids == ('5', '6')
+    assert ctx.target_ids == ('9',)
+
+
+def test_target_ids_for_chunked_child_contexts():
+    from stash_ai_server.tasks.helpers import _make_child_context
+
+    parent = ContextInput(page='images', selectedIds=['1', '2', '3'])
+    assert _make_child_context(['2'], parent).target_ids == ('2',)
+    assert _make_child_context(['1', '3'], parent).target_ids == ('1', '3')
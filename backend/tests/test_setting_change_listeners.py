@@ -0,0 +1,54 @@
+import pathlib
+import sys
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from stash_ai_server.plugin_runtime import settings_registry
+
+
+def test_listener_receives_only_its_plugin_updates():
+    seen: list[tuple[str, object]] = []
+    settings_registry.register_setting_change_listener("demo_plugin", "cache", lambda k, v: seen.append((k, v)))
+    try:
+        settings_registry.notify_setting_changed("demo_plugin", "tag_suffix", "_AI")
+        settings_registry.notify_setting_changed("other_plugin", "tag_suffix", "_X")
+    finally:
+        settings_registry.unregister_setting_change_listener("demo_plugin", "cache")
+
+    assert seen == [("tag_suffix", "_AI")]
+
+
+def test_failing_listener_does_not_block_others():
+    seen: list[str] = []
+
+    def boom(key, value):
+        raise RuntimeError("boom")
+
+    settings_registry.register_setting_change_listener("demo_plugin", "a", boom)
+    settings_registry.register_setting_change_listener("demo_plugin", "b", lambda k, v: seen.append(k))
+    try:
+        settings_registry.notify_setting_changed("demo_plugin", "tag_suffix", "_AI")
+    finally:
+        settings_registry.unregister_setting_change_listener("demo_plugin", "a")
+        settings_registry.unregister_setting_change_listener("demo_plugin", "b")
+
+    assert seen == ["tag_suffix"]
+    assert "demo_plugin" not in settings_registry._CHANGE_LISTENERS
+
+
+def test_unregister_by_plugin_drops_all_listeners():
+    seen: list[str] = []
+    settings_registry.register_setting_change_listener("demo_plugin", "a", lambda k, v: seen.append("a"))
+    settings_registry.register_setting_change_listener("demo_plugin", "b", lambda k, v: seen.append("b"))
+    settings_registry.register_setting_change_listener("other_plugin", "c", lambda k, v: seen.append("c"))
+    try:
+        settings_registry.unregister_setting_change_listeners_by_plugin("demo_plugin")
+        settings_registry.notify_setting_changed("demo_plugin", "tag_suffix", "_AI")
+        settings_registry.notify_setting_changed("other_plugin", "tag_suffix", "_AI")
+    finally:
+        settings_registry.unregister_setting_change_listeners_by_plugin("other_plugin")
+
+    assert seen == ["c"]
+    assert "demo_plugin" not in settings_registry._CHANGE_LISTENERS
@@ -0,0 +1,296 @@
+import pathlib
+import sys
+import types
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+
+@pytest.fixture
+def stash_api_module(monkeypatch):
+    """Import the real stash_api module without touching the settings database."""
+    fake_settings = types.ModuleType("stash_ai_server.core.system_settings")
+    fake_settings.get_value = lambda key, default=None: default
+    monkeypatch.setitem(sys.modules, "stash_ai_server.core.system_settings", fake_settings)
+    # Other tests replace this module with a stub; force a fresh import of the real one.
+    monkeypatch.delitem(sys.modules, "stash_ai_server.utils.stash_api", raising=False)
+    import importlib
+
+    module = importlib.import_module("stash_ai_server.utils.stash_api")
+    yield module
+    sys.modules.pop("stash_ai_server.utils.stash_api", None)
+
+
+class _FakeStashInterface:
+    def __init__(self, tags: dict[int, str] | None = None):
+        self.tags: dict[int, str] = dict(tags or {})
+        self.find_tags_calls: list[dict] = []
+        self.fail_find_tags = False
+
+    def find_tags(self, f=None, fragment=None):
+        self.find_tags_calls.append({"f": f, "fragment": fragment})
+        if self.fail_find_tags:
+            raise RuntimeError("stash unavailable")
+        wanted = f["id"]["value"]
+        return [{"id": str(tag_id), "name": self.tags[tag_id]} for tag_id in wanted if tag_id in self.tags]
+
+
+@pytest.fixture
+def api(stash_api_module):
+    instance = stash_api_module.StashAPI()
+    instance.stash_interface = _FakeStashInterface()
+    return instance
+
+
+def test_tag_cache_evicts_least_recently_used(stash_api_module):
+    cache = stash_api_module._TagBiCache(maxsize=2)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    assert cache.get_id("a") == 1  # touch "a" so "b" becomes the eviction candidate
+    cache.put(3, "c")
+
+    assert len(cache) == 2
+    assert cache.ids_by_name() == {"a": 1, "c": 3}
+    assert cache.names_by_id() == {1: "a", 3: "c"}
+    assert cache.get_name(2) is None
+    assert cache.get_id("b") is None
+
+
+def test_tag_cache_eviction_drops_every_name_of_the_id(stash_api_module):
+    cache = stash_api_module._TagBiCache(maxsize=1)
+    cache.put(1, "kiss", canonical="Kiss")
+    cache.put(2, "Hug")
+
+    assert cache.ids_by_name() == {"Hug": 2}
+    assert cache.names_by_id() == {2: "Hug"}
+
+
+def test_tag_cache_keeps_many_names_per_id(stash_api_module):
+    cache = stash_api_module._TagBiCache()
+    cache.put(1, "Kiss", canonical="Kiss")
+    cache.put(1, "kiss", canonical="Kiss")
+    cache.put("1", "Smooch", canonical="Kiss")  # alias; str ids are normalized
+
+    assert cache.ids_by_name() == {"Kiss": 1, "kiss": 1, "Smooch": 1}
+    assert cache.names_by_id() == {1: "Kiss"}
+    assert cache.get_name("1") == "Kiss"
+
+
+def test_tag_cache_keeps_both_sides_paired(stash_api_module):
+    cache = stash_api_module._TagBiCache()
+    cache.put(1, "old", canonical="old")
+    cache.put(1, "new", canonical="new")  # id renamed in Stash
+    assert cache.ids_by_name() == {"new": 1}
+    assert cache.names_by_id() == {1: "new"}
+
+    cache.put(1, "alias")
+    cache.put(2, "new", canonical="new")  # name re-pointed to another id
+    assert cache.ids_by_name() == {"new": 2}
+    assert cache.names_by_id() == {2: "new"}
+
+    cache.put(2, "extra")
+    cache.put(3, "extra")  # a non-canonical alias moves without dropping its old id
+    assert cache.ids_by_name() == {"new": 2, "extra": 3}
+    assert cache.names_by_id() == {2: "new", 3: "extra"}
+
+
+def test_tag_cache_clear(stash_api_module):
+    cache = stash_api_module._TagBiCache()
+    cache.put(1, "a")
+    cache.put(2, "b")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get_id("a") is None
+    assert cache.get_name(2) is None
+
+
+def test_tag_cache_accessors_and_deprecated_views(stash_api_module):
+    api = stash_api_module.StashAPI()
+    api._tags.put(5, "five")
+
+    assert api.get_cached_tag_id("five") == 5
+    assert api.get_cached_tag_name("5") == "five"
+    with pytest.deprecated_call():
+        view = api.tag_id_cache
+    assert "five" in view
+    with pytest.raises(TypeError):
+        view["other"] = 6
+    with pytest.deprecated_call():
+        assert api.tag_name_cache == {5: "five"}
+
+
+def test_get_stash_tag_names_queries_only_uncached_ids_once(api):
+    api.stash_interface.tags = {1: "cached", 2: "two", 3: "three"}
+    api._tags.put(1, "cached")
+
+    names = api.get_stash_tag_names([1, 2, 3, 2, 4])
+
+    assert names == {1: "cached", 2: "two", 3: "three"}
+    assert len(api.stash_interface.find_tags_calls) == 1
+    call = api.stash_interface.find_tags_calls[0]
+    assert call["f"] == {"id": {"value": [2, 3, 4], "modifier": "INCLUDES"}}
+    assert call["fragment"] == "id name"
+    assert api._tags.names_by_id() == {1: "cached", 2: "two", 3: "three"}
+    assert api._tags.ids_by_name() == {"cached": 1, "two": 2, "three": 3}
+
+
+def test_get_stash_tag_names_skips_query_when_fully_cached(api):
+    api._tags.put(1, "one")
+
+    assert api.get_stash_tag_names([1, 1]) == {1: "one"}
+    assert api.stash_interface.find_tags_calls == []
+
+
+def test_get_stash_tag_names_returns_cached_part_on_error(api):
+    api._tags.put(1, "one")
+    api.stash_interface.fail_find_tags = True
+
+    assert api.get_stash_tag_names([1, 2]) == {1: "one"}
+    assert api._tags.names_by_id() == {1: "one"}
+
+
+class _FakeMarkerInterface:
+    def __init__(self, fail_titles: set[str] | None = None):
+        self.created: list[dict] = []
+        self.fail_titles = fail_titles or set()
+
+    def create_scene_marker(self, marker):
+        if marker["title"] in self.fail_titles:
+            raise RuntimeError(f"cannot create {marker['title']}")
+        self.created.append(marker)
+        return {"id": str(len(self.created))}
+
+
+def test_create_scene_markers_builds_one_payload_per_span(api):
+    api.stash_interface = _FakeMarkerInterface()
+
+    api.create_scene_markers(42, {(7, "Kiss"): [(1.0, 2.0), (5.0, 6.5)], (8, "Hug"): [(3.0, 4.0)]})
+
+    created = sorted(api.stash_interface.created, key=lambda m: m["seconds"])
+    assert created == [
+        {"scene_id": 42, "seconds": 1.0, "end_seconds": 2.0, "primary_tag_id": 7, "tag_ids": [7], "title": "Kiss"},
+        {"scene_id": 42, "seconds": 3.0, "end_seconds": 4.0, "primary_tag_id": 8, "tag_ids": [8], "title": "Hug"},
+        {"scene_id": 42, "seconds": 5.0, "end_seconds": 6.5, "primary_tag_id": 7, "tag_ids": [7], "title": "Kiss"},
+    ]
+
+
+def test_create_scene_markers_single_marker_skips_pool(api, stash_api_module, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("thread pool should not be used for a single marker")
+
+    monkeypatch.setattr(stash_api_module, "ThreadPoolExecutor", no_pool)
+    api.stash_interface = _FakeMarkerInterface()
+
+    api.create_scene_markers(1, {(7, "Kiss"): [(1.0, 2.0)]})
+    api.create_scene_markers(1, {})
+
+    assert len(api.stash_interface.created) == 1
+
+
+def test_create_scene_markers_failure_is_partial_write(api):
+    api.stash_interface = _FakeMarkerInterface(fail_titles={"Hug"})
+
+    with pytest.raises(RuntimeError, match="cannot create Hug"):
+        api.create_scene_markers(1, {(7, "Kiss"): [(1.0, 2.0), (5.0, 6.0)], (8, "Hug"): [(3.0, 4.0)]})
+
+    # The other markers were still created before the failure was raised.
+    assert sorted(m["seconds"] for m in api.stash_interface.created) == [1.0, 5.0]
+
+
+class _FakeTagInterface:
+    def __init__(self, existing: dict[str, str] | None = None, fail_names: set[str] | None = None):
+        self.tags: dict[str, dict] = {name.casefold(): {"id": tag_id, "name": name} for name, tag_id in (existing or {}).items()}
+        self.fail_names = fail_names or set()
+        self.find_calls: list[str] = []
+        self.created: list[dict] = []
+
+    def find_tag(self, name, create=False):
+        self.find_calls.append(name)
+        if name in self.fail_names:
+            raise RuntimeError(f"lookup failed for {name}")
+        tag = self.tags.get(name.casefold())
+        if tag is None and create:
+            tag = self.create_tag({"name": name})
+        return tag
+
+    def create_tag(self, payload):
+        tag = {"id": str(100 + len(self.created)), "name": payload["name"]}
+        self.created.append(payload)
+        self.tags[payload["name"].casefold()] = tag
+        return tag
+
+
+def test_fetch_tag_ids_bulk_only_looks_up_uncached(api):
+    api.stash_interface = _FakeTagInterface(existing={"Known": "2"})
+    api._tags.put("1", "Cached")
+
+    ids = api.fetch_tag_ids_bulk(["Cached", "Known", "Unknown"])
+
+    assert ids == {"Cached": 1, "Known": 2}
+    assert sorted(api.stash_interface.find_calls) == ["Known", "Unknown"]
+    assert api._tags.ids_by_name() == {"Cached": 1, "Known": 2}
+
+
+def test_fetch_tag_ids_bulk_creates_missing_once_per_case_insensitive_name(api):
+    api.stash_interface = _FakeTagInterface()
+
+    ids = api.fetch_tag_ids_bulk(["Foo", "foo", "Bar"], create_if_missing=True)
+
+    assert [payload["name"] for payload in api.stash_interface.created].count("Foo") == 1
+    assert "foo" not in [payload["name"] for payload in api.stash_interface.created]
+    assert ids["Foo"] == ids["foo"]
+    assert set(ids) == {"Foo", "foo", "Bar"}
+
+
+def test_fetch_tag_ids_bulk_creates_under_parent(api):
+    api.stash_interface = _FakeTagInterface()
+
+    ids = api.fetch_tag_ids_bulk(["Child"], parent_id=9, create_if_missing=True)
+
+    assert ids == {"Child": 100}
+    assert api.stash_interface.created == [{"name": "Child", "ignore_auto_tag": True, "parent_ids": [9]}]
+
+
+def test_fetch_tag_ids_bulk_omits_failed_lookups(api):
+    api.stash_interface = _FakeTagInterface(existing={"Good": "5"}, fail_names={"Bad"})
+
+    ids = api.fetch_tag_ids_bulk(["Good", "Bad"])
+
+    assert ids == {"Good": 5}
+    assert api._tags.ids_by_name() == {"Good": 5}
+
+
+def test_fetch_tag_id_caches_case_variants_of_one_tag(api):
+    api.stash_interface = _FakeTagInterface(existing={"Kiss": "7"})
+
+    for _ in range(2):
+        assert api.fetch_tag_id("Kiss") == 7
+        assert api.fetch_tag_id("kiss") == 7
+
+    # One round-trip per spelling; repeats are served from the cache.
+    assert api.stash_interface.find_calls == ["Kiss", "kiss"]
+    assert api.get_cached_tag_name(7) == "Kiss"
+
+
+def test_fetch_tag_id_and_get_stash_tag_name_share_int_ids(api):
+    interface = _FakeTagInterface(existing={"Kiss": "7"})
+    api.stash_interface = interface
+
+    assert api.fetch_tag_id("Kiss") == 7
+    assert api.get_stash_tag_name(7) == "Kiss"
+    assert api.fetch_tag_id("Kiss") == 7
+    assert interface.find_calls == ["Kiss"]
+
+
+def test_get_stash_tag_names_chunks_large_requests(api, stash_api_module, monkeypatch):
+    monkeypatch.setattr(stash_api_module, "_TAG_ID_CHUNK_SIZE", 2)
+    api.stash_interface.tags = {i: f"tag{i}" for i in range(1, 6)}
+
+    names = api.get_stash_tag_names([1, 2, 3, 4, 5, 5])
+
+    assert names == {i: f"tag{i}" for i in range(1, 6)}
+    assert [call["f"]["id"]["value"] for call in api.stash_interface.find_tags_calls] == [[1, 2], [3, 4], [5]]